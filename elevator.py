@@ -9,11 +9,11 @@ shortest possible wait time.
 
 #Imports
 import time
-import threading
 import random
 import os
-
-CLEAR = 'cls' if os.name == 'nt' else 'clear'
+import sys
+from array import array
+from collections import deque
 
 #Elevator directions
 UP = 1
@@ -25,8 +25,142 @@ NUM_OF_ELEVATORS = 3
 #Global time scale, smaller numbers give quicker simulation results
 TIME_SCALE = 0.05
 
+#Redraw the status every this many ticks, capping the draw rate near 30 Hz
+#no matter how fast the simulation itself runs
+PRINT_EVERY = max(1, int(0.033 / TIME_SCALE))
+
 #Decides the method of choosing an elevator. 0 = random, 1 = calculated
-METHOD = 1  
+METHOD = 1
+
+#Pre-built bar and floor label strings for every floor, indexed by floor number,
+#so drawing a frame never allocates fresh strings per elevator
+BARS = tuple("██" * i for i in range(NUM_OF_FLOORS + 1))
+FLOOR_LABELS = tuple(f" [{i}] " for i in range(NUM_OF_FLOORS + 1))
+
+#Number of random values pre-drawn per batch for passenger arrivals
+RNG_BATCH = 4096
+
+#Dedicated RNG instance, skips the shared module-global state and can be
+#seeded from the command line for reproducible runs
+_rng = random.Random()
+randint = _rng.randint
+
+#buffers of pre-drawn passenger start floors, raw destination draws and arrival gaps
+_start_draws = deque()
+_dest_draws = deque()
+_gap_draws = deque()
+
+def popDraw(buf, low, high, _choices=_rng.choices, _range=range):
+    """pops one pre-drawn random int in [low, high] from the buffer
+
+    refills the buffer with RNG_BATCH draws in a single random.choices call when
+    it runs empty, amortizing the per-draw randint overhead across the batch
+
+    Args:
+        buf (deque): buffer of pre-drawn values to pop from
+        low (int): inclusive lower bound of the draw
+        high (int): inclusive upper bound of the draw
+
+    Return:
+        int drawn uniformly from [low, high]
+    """
+    if not buf:
+        buf.extend(_choices(_range(low, high + 1), k=RNG_BATCH))
+    return buf.popleft()
+
+#packed snapshot layout: queue mask in bits 0-12, floor in bits 16-19,
+#direction flag in bit 20 (1 = UP), rider count in bits 21 and up
+STATE_MASK_BITS = 0x1FFF
+STATE_FLOOR_SHIFT = 16
+STATE_DIR_BIT = 1 << 20
+STATE_RIDERS_SHIFT = 21
+
+def packState(elevator):
+    """packs an elevator's snapshot state into a single int
+
+    folds the queue bitmask, current floor, direction and rider count into one
+    32 bit word so a whole building fits in a small contiguous array
+
+    Args:
+        elevator (obj): elevator whose state to pack
+
+    Return:
+        int with the elevator state packed per the STATE_* layout
+    """
+    s = elevator.queue_mask & STATE_MASK_BITS
+    s |= elevator.floor << STATE_FLOOR_SHIFT
+    if elevator.direction == UP:
+        s |= STATE_DIR_BIT
+    s |= len(elevator.riders) << STATE_RIDERS_SHIFT
+    return s
+
+def stateFloor(s):
+    """unpacks the floor from a packed elevator state"""
+    return (s >> STATE_FLOOR_SHIFT) & 0xF
+
+def stateMask(s):
+    """unpacks the queued-floor bitmask from a packed elevator state"""
+    return s & STATE_MASK_BITS
+
+def stateDirection(s):
+    """unpacks the direction (UP or DOWN) from a packed elevator state"""
+    return UP if s & STATE_DIR_BIT else DOWN
+
+def stateRiders(s):
+    """unpacks the rider count from a packed elevator state"""
+    return s >> STATE_RIDERS_SHIFT
+
+#Transition table over every (direction, floor, queue mask) triple, built once at
+#module load. Entries reuse the STATE_* packing for the next mask, floor and
+#direction, with the visited flag in the bit above them
+MASK_SPAN = 1 << (NUM_OF_FLOORS + 1)
+TRANS_VISIT_BIT = 1 << STATE_RIDERS_SHIFT
+
+def _buildTransitions():
+    """precomputes the next state for every possible elevator movement state
+
+    for each (direction, floor, queue mask) triple, runs the reference one-tick
+    logic: keep moving while queued floors remain ahead in the current direction,
+    reverse when only floors behind remain, and visit whenever the floor stepped
+    onto is queued. The per-tick movement then becomes a single table probe
+
+    Return:
+        array of type 'I' with one packed next state per movement state
+    """
+    table = array('I', bytes(4 * 2 * (NUM_OF_FLOORS + 1) * MASK_SPAN))
+    for dir_idx in range(2):
+        up = dir_idx == 0
+        for floor in range(NUM_OF_FLOORS + 1):
+            base = (dir_idx * (NUM_OF_FLOORS + 1) + floor) * MASK_SPAN
+            above_bits = ~((1 << (floor + 1)) - 1)
+            below_bits = (1 << floor) - 1
+            for mask in range(MASK_SPAN):
+                floor_next = floor
+                up_next = up
+                visited = 0
+                mask_next = mask
+                if mask:
+                    above = mask & above_bits
+                    below = mask & below_bits
+                    #step towards the queued floors ahead, reverse if only
+                    #floors behind remain, visit in place if only the current
+                    #floor is queued
+                    if above and (up or not below):
+                        floor_next = floor + 1
+                        up_next = True
+                    elif below:
+                        floor_next = floor - 1
+                        up_next = False
+                    if mask >> floor_next & 1:
+                        visited = TRANS_VISIT_BIT
+                        mask_next = mask & ~(1 << floor_next)
+                entry = mask_next | (floor_next << STATE_FLOOR_SHIFT) | visited
+                if up_next:
+                    entry |= STATE_DIR_BIT
+                table[base | mask] = entry
+    return table
+
+TRANSITION = _buildTransitions()
 
 class Elevator:
     """Elevator which reponds to floor request
@@ -44,19 +178,30 @@ class Elevator:
         floor (int): The evelator's current floor
         floor_count (int): Total number of elevator floors
         direction (int): direction of travel
-        queue (list): List of queued floors
+        queue (deque): queued floors in travel order
+        queue_mask (int): bitmask of queued floors, bit n set when floor n is queued
+        queue_min (int): lowest queued floor, only valid while the queue is not empty
+        queue_max (int): highest queued floor, only valid while the queue is not empty
         riders (list): List of all riders currently queued for travel
     """
+    __slots__ = ('floor', 'floor_count', 'direction', 'queue', 'queue_mask',
+                 'queue_min', 'queue_max', 'riders')
+
     def __init__(self, floor_count, floor=1, direction=UP):
         self.floor = floor
         self.floor_count = floor_count
         self.direction = UP
-        self.queue = list()
+        self.queue = deque()
+        self.queue_mask = 0
+        self.queue_min = 0
+        self.queue_max = 0
         self.riders = list()
     def request(self, floor):
         """Adds the floor to the list of queued floors
 
-        If the floor is valid, and not already queued, adds the floor to the queue 
+        If the floor is valid, and not already queued, adds the floor to the queue.
+        Queued floors are tracked in a bitmask so the membership test is a single
+        bitwise and instead of a list scan
 
         Args:
             floor (int): floor number to request for travel
@@ -67,62 +212,95 @@ class Elevator:
         #return for floors out of range
         if floor < 1 or floor > self.floor_count: return False
         #add floor to queue if it's not already
-        if floor not in self.queue:
-            #print(f"{floor} requested")
-            self.queue.append(floor)
-
-    def move(self):
+        bit = 1 << floor
+        if self.queue_mask & bit: return
+        #update cached extremes, first floor queued sets both
+        if self.queue_mask == 0:
+            self.queue_min = self.queue_max = floor
+        elif floor < self.queue_min:
+            self.queue_min = floor
+        elif floor > self.queue_max:
+            self.queue_max = floor
+        self.queue_mask |= bit
+        self.queue.append(floor)
+
+    def move(self, tick, _TR=TRANSITION, _UP=UP, _DOWN=DOWN,
+             _DIR_STRIDE=(NUM_OF_FLOORS + 1) * MASK_SPAN, _MASK_SPAN=MASK_SPAN,
+             _FLOOR_SHIFT=STATE_FLOOR_SHIFT, _DIR_BIT=STATE_DIR_BIT,
+             _VISIT_BIT=TRANS_VISIT_BIT):
         """Moves the elevator in it's current direction
 
-        Checks if the elevator has any queued floors, then moves one floor towards that floor.
-        Determines the direction of travel based on the next queued floor each move before traveling.
-        If the floor reached is a queued floor, visit the floor for passenger departure and arrival.
-        
-        """
-        #while the queue is not empty, move towards next requested floor
-        if len(self.queue) > 0:
-            self.setDirection()
-            self.floor += self.direction
+        Looks up the precomputed transition for the current (direction, floor,
+        queue mask) state: one table probe yields the next floor, the next
+        direction and whether the floor stepped onto is queued. The elevator
+        keeps travelling in its direction while queued floors remain ahead,
+        reverses otherwise, and visits any queued floor it lands on.
 
-            #If the elevator is on the next requested floor, visit the floor
-            if self.floor == self.queue[0]:
-                return self.visit()
-        return False 
+        Args:
+            tick (int): current simulation tick, used to stamp boarding riders
 
-    def visit(self):
+        Return:
+            list of riders who boarded if a queued floor was visited, None otherwise
+
+        """
+        mask = self.queue_mask
+        if not mask:
+            return None
+        row = 0 if self.direction == _UP else _DIR_STRIDE
+        s = _TR[row + self.floor * _MASK_SPAN | mask]
+        self.floor = (s >> _FLOOR_SHIFT) & 0xF
+        self.direction = _UP if s & _DIR_BIT else _DOWN
+
+        #If the elevator landed on a queued floor, visit the floor
+        if s & _VISIT_BIT:
+            return self.visit(tick)
+        return None
+
+    def visit(self, tick):
         """add or remove riders who requested the current floor
 
         checks for riders who are boarded who have arrived at their destination floor and
         removes them from the rider list. Checks for riders who are not boarded and arrived at their starting floor
-        and adds their destination floor to the queue. Calculates wait time for all boarding
-        passengers. Recalculates direction and returns a list of all passengers who boarded this floor.
+        and adds their destination floor to the queue. Calculates waited ticks for all boarding
+        passengers and returns a list of all passengers who boarded this floor.
+
+        Args:
+            tick (int): current simulation tick, compared against each boarding
+                rider's queued tick to get their waited ticks
 
         Returns:
             list: all passengers who boarded on this floor
 
         """
         boarded = list()
-        #remove riders who requested this floor or request destination of riders entering
+        survivors = list()
+        #one pass: drop riders who reached their destination, board riders at their start floor
         for rider in self.riders:
-            #riders who are boarded and reached destination
-            if self.floor == rider.destination and rider.boarded:
-                self.riders.remove(rider)
-            #riders who are not boarded yet and arrived at starting floor
-            elif self.floor == rider.start and not rider.boarded:
+            if rider.boarded and rider.destination == self.floor:
+                continue
+            if not rider.boarded and rider.start == self.floor:
                 rider.boarded = True
-                rider.wait_time = time.time() - rider.wait_time
+                rider.wait_ticks = tick - rider.wait_ticks
                 boarded.append(rider)
                 self.request(rider.destination)
+            survivors.append(rider)
+        self.riders = survivors
 
-        #Remove current floor from the list
+        #remove the visited floor from the queue and clear its bit; under the
+        #scan order any queued floor on the way can be visited, not just the head
         self.queue.remove(self.floor)
+        self.queue_mask &= ~(1 << self.floor)
 
-        #Determine new direction based on next floor in the queue
-        self.setDirection()
+        #recompute a cached extreme only when the serviced floor was that extreme
+        if self.queue:
+            if self.floor == self.queue_min:
+                self.queue_min = min(self.queue)
+            if self.floor == self.queue_max:
+                self.queue_max = max(self.queue)
 
         return boarded
 
-    def setDirection(self):
+    def setDirection(self, _UP=UP, _DOWN=DOWN):
         """Calculate new direction of elevator
 
         Check for next floor in the queue and recalculate direction based on its relation to the
@@ -132,28 +310,42 @@ class Elevator:
 
         if len(self.queue) > 0:
             if self.queue[0] > self.floor:
-                self.direction = UP
+                self.direction = _UP
             else:
-                self.direction = DOWN
+                self.direction = _DOWN
 
-    def sortQueue(self):
+    def sortQueue(self, _UP=UP):
         """Sorts queue in best order for travel
 
-        Based on current direction, orders queue ascending if UP or descending if DOWN
-        then continues to append the first floor of the queue to the end of the queue if it
-        is in the opposite direction of the current floor and direction of elevator.
-        Continues in current direction as long as there are queued floors in that direction
+        Based on current direction, orders floors in the current direction of travel
+        first, then the floors behind the elevator. Instead of sorting and rotating
+        the list, the queue bitmask is split on the current floor and the set bits of
+        each half are peeled off in floor order, so the whole routine runs in at most
+        one iteration per floor of the building
 
         """
-        if len(self.queue) == 1: return
-        if self.direction == UP:
-            self.queue.sort()
-            while (self.queue[0] < self.floor):
-                self.queue.append(self.queue.pop(0))
+        mask = self.queue_mask
+        if mask == 0: return
+        order = list()
+        if self.direction == _UP:
+            #floors at or above the current floor ascending, then the rest ascending
+            above = mask & ~((1 << self.floor) - 1)
+            below = mask ^ above
+            for m in (above, below):
+                while m:
+                    low = m & -m
+                    order.append(low.bit_length() - 1)
+                    m ^= low
         else:
-            self.queue.sort(reverse=True)
-            while (self.queue[0] > self.floor):
-                self.queue.append(self.queue.pop(0))
+            #floors at or below the current floor descending, then the rest descending
+            below = mask & ((1 << (self.floor + 1)) - 1)
+            above = mask ^ below
+            for m in (below, above):
+                while m:
+                    high = m.bit_length() - 1
+                    order.append(high)
+                    m ^= 1 << high
+        self.queue = deque(order)
 
 
 class Passenger:
@@ -162,23 +354,34 @@ class Passenger:
     used to request starting and ending floors of an elevator and keep track of
     time waiting for elevator arrival
 
+    Args:
+        start (int): starting floor, drawn from the pre-drawn batch when omitted
+        dest_raw (int): raw destination draw in 1..NUM_OF_FLOORS-1, drawn from
+            the pre-drawn batch when omitted
+
     Attributes:
         start (int): starting floor
         destination (int): destination floor
-        wait_time (float): total time waiting for elevator arrival
+        wait_ticks (int): tick the rider was queued on, overwritten with total
+            ticks waited once they board
         boarded (bool): boarding status, true is passenger has boarded the elevator, false otherwise
     """
-    def __init__(self):
-        self.start = random.randint(1, NUM_OF_FLOORS)
-        self.destination = random.randint(1, NUM_OF_FLOORS)
-        self.wait_time = 0
+    __slots__ = ('start', 'destination', 'wait_ticks', 'boarded')
+
+    def __init__(self, start=None, dest_raw=None, _NF=NUM_OF_FLOORS):
+        #floors come from the pre-drawn batches unless given explicitly
+        if start is None:
+            start = popDraw(_start_draws, 1, _NF)
+        if dest_raw is None:
+            dest_raw = popDraw(_dest_draws, 1, _NF - 1)
+        self.start = start
+        #the raw draw spans one floor fewer, skip it past the start for an
+        #unbiased destination in [1, NUM_OF_FLOORS] without a rejection loop
+        self.destination = dest_raw if dest_raw < start else dest_raw + 1
+        self.wait_ticks = 0
         self.boarded = False
 
-        #recalculate destination if it is the same as the starting floor
-        while self.destination == self.start:
-            self.destination = random.randint(0, NUM_OF_FLOORS)
-
-    def getDirection(self):
+    def getDirection(self, _UP=UP, _DOWN=DOWN):
         """Gets the passenger's direction of travel
 
         Determines direction based on destination in relation to the start floor
@@ -188,9 +391,9 @@ class Passenger:
 
         """
         if self.start > self.destination:
-            return DOWN
+            return _DOWN
         else:
-            return UP
+            return _UP
 
     
 class Building:
@@ -204,13 +407,15 @@ class Building:
         floors (int): total number of floors
         elevators (list): list of elevators in the building
         completed (int): total number of passengers who arrived on the elevator
-        total_wait_time (float): total time waited for initial floor requests of all passengers
+        tick (int): current simulation tick, advanced once per step
+        total_wait_ticks (int): total ticks waited for initial floor requests of all passengers
     """
     def __init__(self, num_of_elevators, num_of_floors):
         self.floors = num_of_floors
         self.elevators = list()
         self.completed = 0
-        self.total_wait_time = 0
+        self.tick = 0
+        self.total_wait_ticks = 0
         for i in range(num_of_elevators):
             self.elevators.append(Elevator(num_of_floors))
 
@@ -218,8 +423,8 @@ class Building:
         """Adds a rider to an elevator queue
 
         Chooses an elevator based on the prefered method (Method 0 = random, method 1 = calculated)
-        and adds the rider to that elevator queue. Saves the current time when the rider is queued,
-        used later to calculate total time waited
+        and adds the rider to that elevator queue. Saves the current tick when the rider is queued,
+        used later to calculate total ticks waited
 
         Args:
             rider (obj): a Rider object to be appended into an elevator's queue of riders
@@ -230,9 +435,9 @@ class Building:
 
         #add rider to the list of riders
         e.riders.append(rider)
-        
+
         #Start wait timer
-        rider.wait_time = time.time()
+        rider.wait_ticks = self.tick
         #request the elevator to the rider's starting floor
         e.request(rider.start)
 
@@ -242,7 +447,7 @@ class Building:
 
         Method 0 choose an elevator at random
 
-        method 2 ranks each elevator by distancefrom the rider's starting floor and chooses
+        method 1 ranks each elevator by distance from the rider's starting floor and chooses
         the closest one
 
         Args:
@@ -255,17 +460,12 @@ class Building:
 
         #method 0: chooses elevator by random
         if method == 0:
-            return self.elevators[random.randint(0, len(self.elevators)-1)]
+            return self.elevators[randint(0, len(self.elevators)-1)]
 
-        #method 2: chooses best possible elevator
+        #method 1: chooses best possible elevator
         if method == 1:
-            #pick the closest elevator
-            best = self.elevators[0]
-            for e in self.elevators:
-                if self.getDistance(e, rider) < self.getDistance(best, rider):
-                    best = e
-
-            return best
+            #pick the closest elevator, one distance evaluation per elevator
+            return min(self.elevators, key=lambda e: self.getDistance(e, rider))
 
     def getDistance(self, elevator, rider):
         """Determines the distance between the elevator and the rider's start floor
@@ -287,70 +487,116 @@ class Building:
             return abs(elevator.floor - rider.start)
         elif elevator.direction == UP and elevator.floor > rider.start:
             #find distance to highest floor, then add distance from highest to rider start
-            return abs(max(elevator.queue) - elevator.floor + max(elevator.queue) - rider.start)
+            return abs(elevator.queue_max - elevator.floor + elevator.queue_max - rider.start)
         elif elevator.direction == DOWN and elevator.floor < rider.start:
-            return abs(min(elevator.queue) - elevator.floor + min(elevator.queue) - rider.start)
+            return abs(elevator.queue_min - elevator.floor + elevator.queue_min - rider.start)
         else:
             return abs(elevator.floor - rider.start)
                 
 
+    def snapshot(self):
+        """packs the state of every elevator into one contiguous array
+
+        one 32 bit word per elevator, packed per packState, kept contiguous so
+        analytics or a future vectorized kernel can step all elevators from a
+        single buffer
+
+        Return:
+            array of type 'I' holding one packed state per elevator
+        """
+        return array('I', [packState(e) for e in self.elevators])
+
+    def step(self):
+        """advances the whole simulation by one tick
+
+        single per-tick kernel: advances the tick counter, moves every elevator
+        once and folds any boarding riders into the waited tick and completed
+        trip totals. Keeping the loop in one method with the hot attributes
+        hoisted to locals avoids repeated attribute lookups per elevator per tick
+
+        """
+        tick = self.tick + 1
+        self.tick = tick
+        total = self.total_wait_ticks
+        completed = self.completed
+        for e in self.elevators:
+            riders = e.move(tick)
+            if riders:
+                for rider in riders:
+                    total += rider.wait_ticks
+                    completed += 1
+        self.total_wait_ticks = total
+        self.completed = completed
+
     def run(self):
         """begins run functionality for building and moves each elevator every tick
 
-        moves each elevator in the building eavy tick. if the elevator returns any riders,
-        add rider's wait times to total wait time and increment the completed by one.
-        Print out a visual representation of the elevators and wait for 1 tick
+        single-threaded loop driven by an integer tick counter. Steps the simulation
+        one tick at a time and injects a new random passenger whenever the counter
+        reaches the next arrival tick, drawn as a random offset of 5 to 10 ticks.
+        Prints out a visual representation of the elevators every PRINT_EVERY ticks
+        and waits for 1 tick
 
         """
+        next_arrival_tick = popDraw(_gap_draws, 5, 10)
         while True:
-            for e in self.elevators:
-                riders = e.move()
-                if riders != False:
-                    for rider in riders:
-                        self.total_wait_time += rider.wait_time
-                        self.completed += 1
-            self.printStatus()
+            self.step()
+            #inject the next passenger once their arrival tick is reached
+            if self.tick == next_arrival_tick:
+                self.addRider(Passenger())
+                next_arrival_tick += popDraw(_gap_draws, 5, 10)
+            #throttle drawing so formatting and stdout don't pace the simulation
+            if self.tick % PRINT_EVERY == 0:
+                self.printStatus()
             time.sleep(1*TIME_SCALE)
 
     def printStatus(self):
         """Prints a visual respresentation of the elevators and statistics
 
-        clears console and prints out a horizontal bar in relation to the elevators current floor,
+        moves the cursor home and redraws a horizontal bar in relation to the elevators current floor,
         followed by the floor number, and a list of all floors currently queued.
         Prints total number of passengers who have made it onto the elevator and the average
-        time it took for the elevator to reach them.
+        time it took for the elevator to reach them. The whole frame is built as one
+        string and written with a single call, avoiding a shell clear per tick
 
         """
-        #clear console
-        os.system(CLEAR)   
+        #cursor home, redraw the frame, then clear anything left below it
+        lines = ["\x1b[H"]
         for e in self.elevators:
             #print each elevator
-            print("\u2588" * e.floor * 2, end=" ")
-            print(f"[{e.floor}] {e.queue}")
+            f = e.floor
+            lines.append(BARS[f] + FLOOR_LABELS[f] + f"{list(e.queue)}\x1b[K\n")
         #print statistics
-        print(f"Completed Trips: {self.completed}")
-        print(f"Average Wait Time: {self.getAverageTime()}")
+        lines.append(f"Completed Trips: {self.completed}\x1b[K\n")
+        lines.append(f"Average Wait Time: {self.getAverageTime()}\x1b[K\n\x1b[0J")
+        sys.stdout.write("".join(lines))
+        sys.stdout.flush()
 
     def getAverageTime(self):
-        """calculates average time waited based on total time wated and total start requests completed
-        
+        """calculates average time waited based on total ticks waited and total start requests completed
+
+        waited ticks are only converted to seconds here, at print time, via TIME_SCALE
+
         Return:
-            float for average time
+            float for average time in seconds
 
         """
         #avoid division by 0
         if self.completed > 0:
-            return self.total_wait_time / self.completed
+            return self.total_wait_ticks / self.completed * TIME_SCALE
+
 
+if __name__ == "__main__":
+    #optional seed argument makes the whole simulation reproducible
+    if len(sys.argv) > 1:
+        _rng.seed(int(sys.argv[1]))
 
-#initializes the building with NUM_OF_ELEVATORS, and FLOORS
-b = Building(NUM_OF_ELEVATORS, NUM_OF_FLOORS)
+    #enable VT escape processing on Windows, then clear the screen once
+    if os.name == 'nt': os.system('')
+    sys.stdout.write("\x1b[2J")
 
-#begins Thread for building run function, constantly moving the elevators while the programs randomly adds passangers
-t = threading.Thread(target=b.run)
-t.start()
+    #initializes the building with NUM_OF_ELEVATORS, and FLOORS
+    b = Building(NUM_OF_ELEVATORS, NUM_OF_FLOORS)
 
-while True:
-    #waits for a random amount of time between 5 and 10 seconds (scaled via global TIME_SCALE) and adds a new random passenger
-    time.sleep(random.randint(5, 10)*TIME_SCALE)
-    b.addRider(Passenger())
+    #runs the simulation on the main thread, run injects passengers on its own tick counter
+    b.run()